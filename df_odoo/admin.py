@@ -1,22 +1,41 @@
 from django.contrib import admin
+from django.urls import reverse
+from django.utils.html import format_html
 
+from .dispatcher import run_in_background
 from .models import (
     Company,
     Connection,
     Customer,
+    OdooImage,
+    SyncJob,
 )
 
 
 class OdooModelAdmin(admin.ModelAdmin):
+    def _queue_job(self, request, queryset, kind):
+        job = SyncJob.objects.create(
+            model=queryset.model._meta.label,
+            kind=kind,
+            object_ids=[str(pk) for pk in queryset.values_list("pk", flat=True)],
+        )
+        run_in_background(job)
+        self.message_user(
+            request,
+            format_html(
+                'Queued <a href="{}">{}</a>',
+                reverse("admin:df_odoo_syncjob_change", args=(job.pk,)),
+                job,
+            ),
+        )
+
     @admin.action(description="Load data from odoo")
     def o_load(self, request, queryset):
-        for o in queryset:
-            o.o_load()
+        self._queue_job(request, queryset, SyncJob.Kind.LOAD)
 
     @admin.action(description="Update data in odoo")
     def o_update(self, request, queryset):
-        for o in queryset:
-            o.o_update_or_create()
+        self._queue_job(request, queryset, SyncJob.Kind.UPDATE)
 
     actions = [o_load, o_update]
 
@@ -38,3 +57,37 @@ class CustomerAdmin(OdooModelAdmin):
     list_display = ("o_company", "user", "o_updated")
     search_fields = ("user__email",)
     list_filter = ("o_company__slug",)
+
+
+@admin.register(SyncJob)
+class SyncJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "model",
+        "kind",
+        "o_company",
+        "status",
+        "progress",
+        "processed",
+        "total",
+        "checkpoint",
+        "updated",
+    )
+    list_filter = ("status", "kind", "o_company__slug")
+    readonly_fields = ("checkpoint", "processed", "total", "error")
+
+    @admin.display(description="Progress")
+    def progress(self, obj):
+        return f"{obj.progress}%"
+
+    @admin.action(description="Resume from checkpoint")
+    def resume(self, request, queryset):
+        for job in queryset.resumable():
+            run_in_background(job)
+
+    actions = [resume]
+
+
+@admin.register(OdooImage)
+class OdooImageAdmin(admin.ModelAdmin):
+    list_display = ("hash", "image", "created")
+    search_fields = ("hash",)
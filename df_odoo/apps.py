@@ -6,3 +6,6 @@ class OdooConfig(AppConfig):
     name = "df_odoo"
     api_path = "odoo/"
     verbose_name = "Odoo Integration"
+
+    def ready(self):
+        from . import signals  # noqa: F401
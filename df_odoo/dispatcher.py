@@ -0,0 +1,142 @@
+import atexit
+import logging
+import threading
+
+from django.apps import apps
+from django.db import connections, transaction
+
+from .settings import api_settings
+
+logger = logging.getLogger(__name__)
+
+
+class Coalescer:
+    """
+    Collects items under a key and passes them to `callback(key, items)` once,
+    `window` seconds after the first item for that key arrived.
+
+    Items are collected per process, the callback runs in a background thread.
+    With a `window` of 0 the callback runs immediately in the caller thread.
+    Pending keys are flushed when the process exits.
+    """
+
+    def __init__(self, callback, window):
+        self.callback = callback
+        self.window = window
+        self._pending = {}
+        self._timers = {}
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def add(self, key, *items):
+        window = self.window() if callable(self.window) else self.window
+        if window <= 0:
+            self.callback(key, list(items))
+            return
+
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = []
+                timer = self._timers[key] = threading.Timer(
+                    window, self._flush, args=(key,)
+                )
+                timer.daemon = True
+                timer.start()
+            pending.extend(items)
+
+    def flush(self):
+        """
+        Dispatches all pending keys right away
+        """
+        with self._lock:
+            keys = list(self._pending)
+        for key in keys:
+            self._flush(key)
+
+    def _flush(self, key):
+        with self._lock:
+            if key not in self._pending:
+                # Flushed already
+                return
+            items = self._pending.pop(key)
+            self._timers.pop(key).cancel()
+        try:
+            self.callback(key, items)
+        except Exception:
+            logger.exception("Failed to dispatch %s", key)
+        finally:
+            # The thread opened its own database connections
+            connections.close_all()
+
+
+def run_in_background(job):
+    """
+    Runs a `SyncJob` in a background thread once the current transaction commits,
+    unless another worker claimed it meanwhile
+    """
+
+    def run():
+        try:
+            if job.claim():
+                job.run()
+        except Exception:
+            logger.exception("Sync job %s failed", job.pk)
+        finally:
+            connections.close_all()
+
+    transaction.on_commit(lambda: threading.Thread(target=run, daemon=True).start())
+
+
+_connections = {}
+_connections_lock = threading.Lock()
+
+
+def get_connection(connection_id):
+    """
+    :return: `Connection` shared by the dispatcher threads of this process, so
+        its Odoo login is reused. It's replaced when the connection url changes
+    """
+    connection = apps.get_model("df_odoo", "Connection").objects.get(pk=connection_id)
+    with _connections_lock:
+        shared = _connections.get(connection.pk)
+        if shared is None or shared.url != connection.url:
+            shared = _connections[connection.pk] = connection
+    return shared
+
+
+def forget_connection(connection_id):
+    """
+    Drops the shared connection, e.g. after its Odoo session expired
+    """
+    with _connections_lock:
+        _connections.pop(connection_id, None)
+
+
+def get_odoo_company_models(o_model):
+    """
+    :return: Django models synced from the given Odoo model per company
+    """
+    from .models import OdooCompanyModelMixin
+
+    return [
+        model
+        for model in apps.get_models()
+        if issubclass(model, OdooCompanyModelMixin)
+        and model.o_model == o_model
+        and model.o_field_map
+    ]
+
+
+def run_queued_job(job_id, _items=None):
+    """
+    Runs a queued `SyncJob`, e.g. with the changes Odoo notified us about,
+    unless another worker claimed it meanwhile
+    """
+    job = apps.get_model("df_odoo", "SyncJob").objects.get(pk=job_id)
+    if job.claim():
+        job.run()
+
+
+# Change jobs by id, the ids are stored in the jobs
+odoo_changes = Coalescer(run_queued_job, lambda: api_settings.WEBHOOK_COALESCE_WINDOW)
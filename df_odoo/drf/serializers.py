@@ -1,7 +1,11 @@
+from functools import partial
+
+from django.db import transaction
 from hashid_field.rest import HashidSerializerCharField
 from rest_framework import serializers
 
-from ..models import Company
+from ..dispatcher import get_odoo_company_models, odoo_changes
+from ..models import Company, SyncJob
 
 
 class CompanyBaseSerializer(serializers.ModelSerializer):
@@ -36,3 +40,39 @@ class CompanyConnectSerializer(CompanyBaseSerializer):
         model = Company
         read_only_fields = ("website_url", "url", "name", "slug", "city", "street")
         fields = read_only_fields + ("redirect",)
+
+
+class OdooChangeSerializer(serializers.Serializer):
+    model = serializers.CharField()
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False
+    )
+    operation = serializers.ChoiceField(
+        choices=("create", "write", "unlink"), default="write"
+    )
+    # Odoo id of the company, changes are applied to all connection companies if empty
+    company_id = serializers.IntegerField(required=False)
+
+    def validate_model(self, value):
+        if not get_odoo_company_models(value):
+            raise serializers.ValidationError(f"Model {value} is not synced")
+        return value
+
+    def save(self, **kwargs):
+        connection = self.context["connection"]
+        companies = Company.objects.filter(o_db=connection)
+        if "company_id" in self.validated_data:
+            companies = companies.filter(o_id=self.validated_data["company_id"])
+
+        kind = (
+            SyncJob.Kind.UNLINK
+            if self.validated_data["operation"] == "unlink"
+            else SyncJob.Kind.CHANGES
+        )
+        for company in companies:
+            for model in get_odoo_company_models(self.validated_data["model"]):
+                # Stored before answering, so no notified id is lost
+                job = SyncJob.objects.queue_changes(
+                    company, model._meta.label, kind, self.validated_data["ids"]
+                )
+                transaction.on_commit(partial(odoo_changes.add, job.pk))
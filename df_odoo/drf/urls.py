@@ -1,7 +1,7 @@
 from django.conf import settings
 from rest_framework.routers import DefaultRouter, SimpleRouter
 
-from .viewsets import CompanyViewSet
+from .viewsets import CompanyViewSet, ConnectionViewSet
 
 urlpatterns = []
 
@@ -11,5 +11,6 @@ else:
     router = SimpleRouter()
 
 router.register("companies", CompanyViewSet, basename="companies")
+router.register("connections", ConnectionViewSet, basename="connections")
 
 urlpatterns += router.urls
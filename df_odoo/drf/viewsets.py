@@ -1,10 +1,35 @@
-from rest_framework import permissions, response
+import hashlib
+import hmac
+import json
+
+from django.core.cache import cache
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework import permissions, response, status
 from rest_framework.decorators import action
 from rest_framework.mixins import RetrieveModelMixin
 from rest_framework.viewsets import GenericViewSet
 
-from ..models import Company
-from .serializers import CompanyConnectSerializer, CompanySerializer
+from ..models import Company, Connection
+from ..settings import api_settings
+from .serializers import (
+    CompanyConnectSerializer,
+    CompanySerializer,
+    OdooChangeSerializer,
+)
+
+
+class IsOdooWebhook(permissions.BasePermission):
+    """
+    Checks the `X-Odoo-Token` header against the connection webhook token
+    """
+
+    def has_object_permission(self, request, view, obj):
+        token = request.headers.get("X-Odoo-Token", "")
+        return bool(obj.webhook_token) and hmac.compare_digest(
+            token.encode(), obj.webhook_token.encode()
+        )
 
 
 class CompanyViewSet(
@@ -21,11 +46,52 @@ class CompanyViewSet(
         Handles special case of '0' or 0 or '_' meaning current user
         :return: requested user details
         """
-        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
-        if self.kwargs[lookup_url_kwarg] in (0, "0", "_"):
-            return self.get_queryset().first()
+        if self._is_current_lookup():
+            instance = self.get_queryset().order_by("pk").first()
+            if instance is None:
+                raise Http404
+            return instance
         return super().get_object()
 
+    def _is_current_lookup(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return self.kwargs[lookup_url_kwarg] in (0, "0", "_")
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Serves serialized companies from the cache, and answers with 304
+        when the client already has the current version.
+
+        Cache hits skip `get_queryset` and `check_object_permissions`, only the
+        current company (`_`) is cached per user. Subclasses that scope
+        companies per user should override `retrieve` to bypass the cache.
+        """
+        if self._is_current_lookup():
+            key = Company.cache_key("_", request.user)
+        else:
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            key = Company.cache_key(self.kwargs[lookup_url_kwarg])
+
+        cached = cache.get(key)
+        if cached is None:
+            data = dict(self.get_serializer(self.get_object()).data)
+            cached = {
+                "data": data,
+                "etag": quote_etag(
+                    hashlib.md5(  # noqa: S324
+                        json.dumps(data, sort_keys=True, default=str).encode()
+                    ).hexdigest()
+                ),
+            }
+            cache.set(key, cached, api_settings.COMPANY_CACHE_TIMEOUT)
+
+        # No Last-Modified: `o_updated` doesn't change on every payload change
+        not_modified = get_conditional_response(request, etag=cached["etag"])
+        if not_modified is not None:
+            not_modified["ETag"] = cached["etag"]
+            return not_modified
+        return response.Response(cached["data"], headers={"ETag": cached["etag"]})
+
     @action(methods=["POST"], detail=True, serializer_class=CompanyConnectSerializer)
     def connect(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -33,3 +99,23 @@ class CompanyViewSet(
         serializer.is_valid(raise_exception=True)
         serializer.save()
         return response.Response(serializer.data)
+
+
+class ConnectionViewSet(GenericViewSet):
+    authentication_classes = ()
+    permission_classes = (IsOdooWebhook,)
+    queryset = Connection.objects.all()
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), "connection": self.get_object()}
+
+    @action(methods=["POST"], detail=True, serializer_class=OdooChangeSerializer)
+    def notify(self, request, *args, **kwargs):
+        """
+        Accepts change notifications from Odoo automated actions and loads
+        the changed records in the background
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return response.Response(serializer.data, status=status.HTTP_202_ACCEPTED)
@@ -0,0 +1,180 @@
+import time
+from contextlib import contextmanager
+from uuid import uuid4
+
+from django.core.cache import cache
+
+from .settings import api_settings
+
+# Limits are stored in thousandths of a slot, so increases can use atomic `incr`
+MILLI = 1000
+# Seconds bulk calls keep yielding after an interactive call stopped waiting,
+# longer than the longest wait between two slot attempts
+WAITING_TTL = 1
+
+
+class Lane:
+    # Calls a user is waiting for, e.g. checkout in `df_odoo.utils`
+    INTERACTIVE = "interactive"
+    # Background traffic, e.g. `load_odoo_*` syncs
+    BULK = "bulk"
+
+
+class ConnectionLimiter:
+    """
+    Adaptive (AIMD) limit of concurrent RPC calls to one Odoo instance.
+
+    Every lane has its own limit: it grows by one slot per window of calls and
+    is cut at most once per `RPC_DECREASE_INTERVAL` when a call fails or is
+    slower than `RPC_LATENCY_TOLERANCE` times the fastest recent call of the
+    same model and method. Bulk calls may only take `RPC_BULK_SHARE` of the
+    interactive slots and wait while interactive calls are queued, so slow
+    syncs never shrink interactive capacity.
+
+    Slots and limits live in the Django cache, so they are shared between
+    processes when the cache backend is shared. Every call holds a slot key
+    leased for `RPC_SLOT_LEASE` seconds, so slots of crashed workers expire.
+    """
+
+    def __init__(self, connection_id):
+        self.prefix = f"df_odoo:limiter:{connection_id}"
+
+    def _key(self, name):
+        return f"{self.prefix}:{name}"
+
+    def limit(self, lane):
+        milli = cache.get_or_set(
+            self._key(f"limit:{lane}"), api_settings.RPC_LIMIT_INITIAL * MILLI, None
+        )
+        return milli / MILLI
+
+    def _capacity(self, lane):
+        interactive_limit = int(self.limit(Lane.INTERACTIVE))
+        if lane == Lane.INTERACTIVE:
+            return interactive_limit
+        if cache.get(self._key("waiting")):
+            return 0
+        return max(
+            1,
+            min(
+                int(self.limit(Lane.BULK)),
+                int(interactive_limit * api_settings.RPC_BULK_SHARE),
+            ),
+        )
+
+    def _take_slot(self, lane):
+        # Bulk calls only take the lowest slots, so they stay within their share
+        keys = [self._key(f"slot:{i}") for i in range(self._capacity(lane))]
+        taken = cache.get_many(keys)
+        token = uuid4().hex
+        for key in keys:
+            if key not in taken and cache.add(key, token, api_settings.RPC_SLOT_LEASE):
+                return key, token
+        return None
+
+    def acquire(self, lane=Lane.INTERACTIVE):
+        """
+        Waits for a free slot. After `RPC_ACQUIRE_TIMEOUT` seconds the call
+        proceeds anyway, the limiter never fails a call by itself.
+
+        :return: (key, token) of the taken slot, None on timeout
+        """
+        deadline = time.monotonic() + api_settings.RPC_ACQUIRE_TIMEOUT
+        delay = 0.01
+        while True:
+            slot = self._take_slot(lane)
+            if slot or time.monotonic() >= deadline:
+                return slot
+            if lane == Lane.INTERACTIVE:
+                # Expires shortly after the last interactive call stops waiting
+                cache.set(self._key("waiting"), 1, WAITING_TTL)
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+
+    def _is_slow(self, lane, operation, latency):
+        """
+        Compares the latency with the minimum of the last two
+        `RPC_BASELINE_WINDOW` windows, so gradual overload is noticed too
+        """
+        key = self._key(f"baseline:{lane}:{operation}")
+        now = time.time()
+        window = cache.get(key)
+        if window is None:
+            window = {"start": now, "min": latency, "previous": latency}
+        elif now - window["start"] >= api_settings.RPC_BASELINE_WINDOW:
+            window = {"start": now, "min": latency, "previous": window["min"]}
+        baseline = min(window["min"], window["previous"])
+        window["min"] = min(window["min"], latency)
+        cache.set(key, window, None)
+        return latency > baseline * api_settings.RPC_LATENCY_TOLERANCE
+
+    def release(self, slot, latency, failed=False, lane=Lane.INTERACTIVE, operation=""):
+        """
+        :param slot: slot returned by `acquire`
+        :param operation: model and method of the call, latencies are compared
+            per operation
+        """
+        if slot:
+            key, token = slot
+            # Unless the lease expired and another call took the slot
+            if cache.get(key) == token:
+                cache.delete(key)
+
+        key = self._key(f"limit:{lane}")
+        limit = self.limit(lane)
+        if self._is_slow(lane, operation, latency) or failed:
+            # Only the first slow call of a window cuts the limit
+            if cache.add(
+                self._key(f"decreased:{lane}"), 1, api_settings.RPC_DECREASE_INTERVAL
+            ):
+                limit = max(
+                    limit * api_settings.RPC_LIMIT_DECREASE, api_settings.RPC_LIMIT_MIN
+                )
+                cache.set(key, round(limit * MILLI), None)
+            return
+
+        try:
+            milli = cache.incr(key, round(MILLI / limit))
+        except ValueError:
+            # The limit was evicted meanwhile, or the cache doesn't keep values
+            milli = round((limit + 1 / limit) * MILLI)
+            cache.add(key, milli, None)
+        if milli > api_settings.RPC_LIMIT_MAX * MILLI:
+            cache.set(key, api_settings.RPC_LIMIT_MAX * MILLI, None)
+
+    @contextmanager
+    def slot(self, lane=Lane.INTERACTIVE, operation=""):
+        slot = self.acquire(lane)
+        started = time.monotonic()
+        failed = False
+        try:
+            yield
+        except OSError:
+            # Timeouts and connection errors, not Odoo business errors
+            failed = True
+            raise
+        finally:
+            self.release(slot, time.monotonic() - started, failed, lane, operation)
+
+
+class LimitedODOO:
+    """
+    Proxy of an `odoorpc.ODOO` connection running `execute` and `execute_kw`
+    calls through the connection limiter
+    """
+
+    def __init__(self, rpc, limiter, lane):
+        self._odoo = rpc
+        self._limiter = limiter
+        self._lane = lane
+
+    def execute(self, model, method, *args, **kwargs):
+        with self._limiter.slot(self._lane, f"{model}:{method}"):
+            return self._odoo.execute(model, method, *args, **kwargs)
+
+    def execute_kw(self, model, method, *args, **kwargs):
+        with self._limiter.slot(self._lane, f"{model}:{method}"):
+            return self._odoo.execute_kw(model, method, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._odoo, name)
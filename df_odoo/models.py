@@ -2,31 +2,155 @@ from __future__ import annotations
 
 import base64
 import hashlib
+import json
+from datetime import timedelta
+from functools import lru_cache
 from itertools import chain
 from typing import Optional
 from uuid import uuid4
 
 import odoorpc
+from django.apps import apps
 from django.conf import settings
+from django.core.cache import cache
 from django.core.files.base import ContentFile
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.db.models import CharField, TextField
 from django.utils import timezone
 from environ import urlparse
 
+from .limiter import ConnectionLimiter, Lane, LimitedODOO
+from .settings import api_settings
 
-def _format_value(field, value):
-    if isinstance(field, (TextField, CharField)) and value is False:
-        # Odoo returns False for empty strings
-        return ""
 
-    if isinstance(value, list) and isinstance(value[0], int):
+def _odoo_value(value):
+    if isinstance(value, list) and value and isinstance(value[0], int):
         # Extract instance string value from odoo foreign key
         return value[1]
 
     return value
 
 
+def _odoo_text_value(value):
+    if value is False or value == []:
+        # Odoo returns False for empty strings and [] for empty relations
+        return ""
+
+    return _odoo_value(value)
+
+
+def _odoo_fk_value(value):
+    if value is False:
+        return None
+
+    if isinstance(value, list):
+        return value[0] if value else None
+
+    return value
+
+
+def _value_converter(field):
+    if isinstance(field, (TextField, CharField)):
+        return _odoo_text_value
+    return _odoo_value
+
+
+class FieldPlan:
+    """
+    Field maps of an Odoo synced model compiled once into converters, so the
+    sync loop doesn't resolve model fields for every record.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        # (odoo field, django field, value converter)
+        self.columns = [
+            (o_field, d_field, _value_converter(getattr(model, d_field).field))
+            for o_field, d_field in model.o_field_map.items()
+        ]
+        # (odoo field, django fk attname)
+        self.fk_columns = [
+            (o_field, f"{d_field}_id")
+            for o_field, d_field in model.o_fk_field_map.items()
+        ]
+        # (odoo field, django m2m field)
+        self.m2m_columns = list(model.o_m2m_field_map.items())
+        # odoo field -> related django model
+        self.related_models = {}
+        for o_field, d_field in chain(
+            model.o_m2m_field_map.items(), model.o_fk_field_map.items()
+        ):
+            field = getattr(model, d_field)
+            related_model = field.field.related_model
+            if getattr(field, "reverse", None) is True:
+                related_model = field.field.model
+            self.related_models[o_field] = related_model
+        self.o_fields = (
+            list(model.o_field_map.keys())
+            + list(model.o_fk_field_map.keys())
+            + list(model.o_m2m_field_map.keys())
+        )
+
+    def defaults(self, company):
+        return {
+            field: value(company) if callable(value) else value
+            for field, value in self.model.o_defaults.items()
+        }
+
+    def rows(self, odoo_models, odoo_to_django_ids, defaults):
+        """
+        :return: django field values for every odoo record, filled column by column
+        """
+        rows = [{} for _ in odoo_models]
+
+        # Set regular fields
+        for o_field, d_field, convert in self.columns:
+            for row, odoo_model in zip(rows, odoo_models):
+                row[d_field] = convert(odoo_model[o_field])
+
+        # Set fk fields
+        for o_field, d_attname in self.fk_columns:
+            d_ids = odoo_to_django_ids[o_field]
+            for row, odoo_model in zip(rows, odoo_models):
+                row[d_attname] = d_ids.get(_odoo_fk_value(odoo_model[o_field]))
+
+        # Set defaults
+        for row in rows:
+            row.update(defaults)
+
+        return rows
+
+    def m2m_rows(self, odoo_models, odoo_to_django_ids):
+        """
+        :return: django ids of m2m fields for every odoo record
+        """
+        rows = [{} for _ in odoo_models]
+        for o_field, d_field in self.m2m_columns:
+            d_ids = odoo_to_django_ids[o_field]
+            for row, odoo_model in zip(rows, odoo_models):
+                row[d_field] = [
+                    d_ids[o_id] for o_id in odoo_model[o_field] or [] if d_ids.get(o_id)
+                ]
+        return rows
+
+
+@lru_cache(maxsize=None)
+def get_field_plan(model) -> FieldPlan:
+    return FieldPlan(model)
+
+
+def _bulk_connect(dbs, connection):
+    # Reuse one login per connection for the whole job
+    if connection.pk not in dbs:
+        dbs[connection.pk] = connection.connect(lane=Lane.BULK)
+    return dbs[connection.pk]
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
 class OdooQuerySet(models.QuerySet):
     def search(self, db, **kwargs):
         return db.env[self.model.o_model].search(kwargs)
@@ -35,65 +159,123 @@ class OdooQuerySet(models.QuerySet):
         for o in self.search(db, **kwargs):
             print(vars(o))
 
-    def load_odoo_to_django(self, company: Company):  # noqa: C901
+    def load_odoo_to_django(self, company: Company, job: Optional[SyncJob] = None):
+        """
+        Loads all Odoo records of this model into Django.
+
+        Records are read and saved in chunks ordered by Odoo id. When a `job` is
+        given, the job checkpoint is advanced after every chunk, and only records
+        after the checkpoint are fetched, so a failed run can be resumed.
+        """
         if not self.model.o_field_map:
             raise RuntimeError(
                 f"you need to specify `o_field_map` for the {self.model._meta.label} model"
             )
 
-        # Fetch odoo data
-        db = company.o_db.connect()
-        odoo_ids = db.execute(self.model.o_model, "search", [])
-        odoo_models = db.execute(
-            self.model.o_model,
-            "read",
-            odoo_ids,
-            list(self.model.o_field_map.keys())
-            + list(self.model.o_fk_field_map.keys())
-            + list(self.model.o_m2m_field_map.keys()),
-        )
+        # Fetch odoo ids left to sync
+        db = company.o_db.connect(lane=Lane.BULK)
+        domain = [("id", ">", job.checkpoint)] if job else []
+        odoo_ids = sorted(db.execute(self.model.o_model, "search", domain))
+        if job:
+            job.start(len(odoo_ids))
+
+        plan = get_field_plan(self.model)
+        defaults = plan.defaults(company)
+        odoo_to_django_ids = self._odoo_to_django_ids(company)
+        for chunk in _chunks(odoo_ids, api_settings.SYNC_CHUNK_SIZE):
+            odoo_models = db.execute(self.model.o_model, "read", chunk, plan.o_fields)
+            with transaction.atomic():
+                self._save_odoo_models(
+                    company, odoo_models, odoo_to_django_ids, defaults
+                )
+                if job:
+                    job.advance(len(chunk), checkpoint=chunk[-1])
 
-        # Fetch odoo_id -> django_id mapping for related objects
+    def load_odoo_ids(self, company: Company, odoo_ids, job: Optional[SyncJob] = None):
+        """
+        Loads only the given Odoo records into Django, e.g. after Odoo notified
+        us about their changes.
+
+        Like in `load_odoo_to_django`, the `job` checkpoint is the last loaded
+        Odoo id.
+        """
+        if not self.model.o_field_map:
+            raise RuntimeError(
+                f"you need to specify `o_field_map` for the {self.model._meta.label} model"
+            )
+
+        odoo_ids = sorted(set(odoo_ids))
+        if job:
+            odoo_ids = [o_id for o_id in odoo_ids if o_id > job.checkpoint]
+            job.start(len(odoo_ids))
+
+        db = company.o_db.connect(lane=Lane.BULK)
+        plan = get_field_plan(self.model)
+        defaults = plan.defaults(company)
+        for chunk in _chunks(odoo_ids, api_settings.SYNC_CHUNK_SIZE):
+            # Skip records deleted since the notification, `read` fails on them
+            existing = db.execute(self.model.o_model, "search", [("id", "in", chunk)])
+            odoo_models = (
+                db.execute(self.model.o_model, "read", existing, plan.o_fields)
+                if existing
+                else []
+            )
+            odoo_to_django_ids = self._odoo_to_django_ids(company, odoo_models)
+            with transaction.atomic():
+                self._save_odoo_models(
+                    company, odoo_models, odoo_to_django_ids, defaults
+                )
+                if job:
+                    job.advance(len(chunk), checkpoint=chunk[-1])
+
+    def delete_odoo_ids(
+        self, company: Company, odoo_ids, job: Optional[SyncJob] = None
+    ):
+        """
+        Deletes the instances of the given Odoo records, e.g. after Odoo notified
+        us about their deletion.
+        """
+        odoo_ids = set(odoo_ids)
+        if job:
+            job.start(len(odoo_ids))
+        with transaction.atomic():
+            self.filter(o_company=company, o_id__in=odoo_ids).delete()
+            if job:
+                job.advance(len(odoo_ids))
+
+    def _odoo_to_django_ids(self, company, odoo_models=None):
+        """
+        Fetches odoo_id -> django_id mapping for related objects.
+
+        :param odoo_models: if given, only ids referenced by these records are fetched
+        """
         odoo_to_django_ids = {}
-        for o_field, d_field in chain(
-            self.model.o_m2m_field_map.items(), self.model.o_fk_field_map.items()
-        ):
-            field = getattr(self.model, d_field)
-            model = field.field.related_model
-            if getattr(field, "reverse", None) is True:
-                model = field.field.model
+        for o_field, model in get_field_plan(self.model).related_models.items():
+            related = model.objects.filter(o_company=company, o_id__isnull=False)
+            if odoo_models is not None:
+                o_ids = set()
+                for odoo_model in odoo_models:
+                    value = odoo_model[o_field]
+                    if (
+                        isinstance(value, list)
+                        and o_field in self.model.o_m2m_field_map
+                    ):
+                        o_ids.update(value)
+                    elif isinstance(value, list) and value:
+                        o_ids.add(value[0])
+                related = related.filter(o_id__in=o_ids)
 
             odoo_to_django_ids[o_field] = {
-                item[0]: item[1]
-                for item in model.objects.filter(
-                    o_company=company, o_id__isnull=False
-                ).values_list("o_id", "id")
+                item[0]: item[1] for item in related.values_list("o_id", "id")
             }
+        return odoo_to_django_ids
 
-        for odoo_model in odoo_models:
-            # Set regular fields
-            fields = {}
-            for o_field, d_field in self.model.o_field_map.items():
-                fields[d_field] = _format_value(
-                    getattr(self.model, d_field).field, odoo_model[o_field]
-                )
-
-            # Set fk fields
-            for o_field, d_field in self.model.o_fk_field_map.items():
-                o_id = odoo_model[o_field]
-                if o_id is False:
-                    o_id = None
-                elif isinstance(o_id, list):
-                    o_id = o_id[0]
-                d_id = odoo_to_django_ids[o_field].get(o_id)
-                fields[f"{d_field}_id"] = d_id
-
-            # Set defaults
-            for field, value in self.model.o_defaults.items():
-                if callable(value):
-                    value = value(company)
-                fields[field] = value
+    def _save_odoo_models(self, company, odoo_models, odoo_to_django_ids, defaults):
+        plan = get_field_plan(self.model)
+        rows = plan.rows(odoo_models, odoo_to_django_ids, defaults)
+        m2m_rows = plan.m2m_rows(odoo_models, odoo_to_django_ids)
 
+        for odoo_model, fields, m2m_fields in zip(odoo_models, rows, m2m_rows):
             # Create/update an instance
             instance, _ = self.model.objects.update_or_create(
                 o_id=odoo_model["id"],
@@ -102,64 +284,263 @@ class OdooQuerySet(models.QuerySet):
             )
 
             # Set m2m fields
-            for o_field, d_field in self.model.o_m2m_field_map.items():
-                o_ids = odoo_model[o_field]
-                if o_ids is False:
-                    o_ids = []
-                d_ids = [
-                    odoo_to_django_ids[o_field].get(o_id)
-                    for o_id in o_ids
-                    if odoo_to_django_ids[o_field].get(o_id)
-                ]
+            for d_field, d_ids in m2m_fields.items():
                 getattr(instance, d_field).set(d_ids)
 
-    def load_odoo_images(self, company: Company):
+    def load_odoo_images(self, company: Company, job: Optional[SyncJob] = None):
+        """
+        Loads images of the synced instances from Odoo.
+
+        Works like `load_odoo_to_django`: instances are processed in chunks
+        ordered by Odoo id and the `job` checkpoint is advanced after every chunk.
+        """
         if not self.model.o_image_field or not self.model.d_image_field:
             raise RuntimeError(
                 f"you need to specify `o_image_field` and `d_image_field` "
                 f"for the {self.model._meta.label} model"
             )
 
-        for instance in self.model.objects.filter(o_company=company).all():
-            if not instance.o_id:
-                # Instance isn't synced with odoo
-                continue
+        # Instances without o_id aren't synced with odoo
+        instances = self.model.objects.filter(
+            o_company=company, o_id__isnull=False
+        ).order_by("o_id")
+        if job:
+            instances = instances.filter(o_id__gt=job.checkpoint)
+            job.start(instances.count())
 
-            db = company.o_db.connect()
+        db = company.o_db.connect(lane=Lane.BULK)
+        for chunk in _chunks(list(instances), api_settings.SYNC_IMAGE_CHUNK_SIZE):
             data = db.execute(
-                self.model.o_model, "read", [instance.o_id], [self.model.o_image_field]
+                self.model.o_model,
+                "read",
+                [instance.o_id for instance in chunk],
+                [self.model.o_image_field],
             )
+            images = {item["id"]: item.get(self.model.o_image_field) for item in data}
 
-            image_content = data[0].get(self.model.o_image_field, None)
-            if not image_content:
-                # No image in odoo
-                continue
+            changed = []
+            for instance in chunk:
+                image_content = images.get(instance.o_id)
+                if not image_content:
+                    # No image in odoo
+                    continue
 
-            image_bytes = base64.b64decode(image_content)
-            image_hash = hashlib.md5(image_bytes).hexdigest()  # noqa: S324
+                image_bytes = base64.b64decode(image_content)
+                image_hash = hashlib.md5(image_bytes).hexdigest()  # noqa: S324
 
-            if instance.o_image_hash == image_hash:
-                # We alreary loaded this image earlier
-                continue
+                if instance.o_image_hash == image_hash:
+                    # We alreary loaded this image earlier
+                    continue
+
+                changed.append((instance, image_hash, image_bytes))
+
+            self._save_odoo_images(changed)
+
+            if job:
+                job.advance(len(chunk), checkpoint=chunk[-1].o_id)
+
+    def _save_odoo_images(self, changed):
+        """
+        :param changed: (instance, image hash, image bytes) of changed images
+        """
+        if api_settings.CONTENT_ADDRESSED_IMAGES and self._shares_image_storage():
+            self._save_shared_odoo_images(changed)
+            return
 
+        for instance, image_hash, image_bytes in changed:
             image_field = getattr(instance, self.model.d_image_field)
             image_field.save("image.jpg", ContentFile(image_bytes))
             instance.o_image_hash = image_hash
             instance.save()
 
+    def _shares_image_storage(self):
+        storage = self.model._meta.get_field(self.model.d_image_field).storage
+        shared = OdooImage._meta.get_field("image").storage
+        return storage is shared or storage.deconstruct() == shared.deconstruct()
+
+    def _save_shared_odoo_images(self, changed):
+        d_image_field = self.model.d_image_field
+        # Image file names by hash, shared by all instances with the image
+        stored = dict(
+            OdooImage.objects.filter(
+                hash__in={image_hash for _, image_hash, _ in changed}
+            ).values_list("hash", "image")
+        )
+        # Current files of the instances which are shared already
+        shared = set(
+            OdooImage.objects.filter(
+                image__in={
+                    getattr(instance, d_image_field).name for instance, _, _ in changed
+                }
+            ).values_list("image", flat=True)
+        )
+
+        for instance, image_hash, image_bytes in changed:
+            image_field = getattr(instance, d_image_field)
+            old_name = image_field.name
+            if image_hash not in stored:
+                stored[image_hash] = OdooImage.store(image_hash, image_bytes).image.name
+            image_field.name = stored[image_hash]
+            instance.o_image_hash = image_hash
+            instance.save()
+
+            if old_name and old_name not in shared:
+                # Per-instance file replaced by the shared one
+                image_field.storage.delete(old_name)
+
+    def _o_job_chunks(self, pks, job=None):
+        """
+        Yields chunks of the objects with the given pks. The `job` checkpoint is
+        the position in `pks`, so any pk type works and deleted objects don't
+        shift it. It is advanced once the caller is done with a chunk.
+        """
+        queryset = self.order_by("pk")
+        if issubclass(self.model, OdooCompanyModelMixin):
+            queryset = queryset.select_related("o_company__o_db")
+        else:
+            queryset = queryset.select_related("o_db")
+
+        pks = list(pks)
+        offset = job.checkpoint if job else 0
+        if job:
+            job.start(len(pks) - offset)
+        for start in range(offset, len(pks), api_settings.SYNC_CHUNK_SIZE):
+            chunk = pks[start : start + api_settings.SYNC_CHUNK_SIZE]
+            yield list(queryset.filter(pk__in=chunk))
+            if job:
+                job.advance(len(chunk), checkpoint=start + len(chunk))
+
+    def o_load_objects(self, pks, job: Optional[SyncJob] = None):
+        """
+        Loads the given objects from Odoo with one multi-id `read` per chunk and
+        connection. Fields mapped to properties are only pushed to Odoo.
+        """
+        fields = {field.name: field for field in self.model._meta.concrete_fields}
+        columns = [
+            (o_field, d_field, _value_converter(fields[d_field]))
+            for o_field, d_field in self.model.o_field_map.items()
+            if d_field in fields
+        ]
+        d_fields = [d_field for _, d_field, _ in columns]
+
+        dbs = {}
+        for chunk in self._o_job_chunks(pks, job):
+            by_connection = {}
+            for instance in chunk:
+                if instance.o_id:
+                    by_connection.setdefault(instance.o_db, []).append(instance)
+
+            for connection, instances in by_connection.items():
+                data = _bulk_connect(dbs, connection).execute(
+                    self.model.o_model,
+                    "read",
+                    [instance.o_id for instance in instances],
+                    [o_field for o_field, _, _ in columns],
+                )
+                records = {record["id"]: record for record in data}
+                for instance in instances:
+                    record = records.get(instance.o_id)
+                    if record is None:
+                        # Deleted in odoo
+                        continue
+                    for o_field, d_field, convert in columns:
+                        setattr(instance, d_field, convert(record[o_field]))
+                    instance.save(update_fields=d_fields)
+
+    def o_update_objects(self, pks, job: Optional[SyncJob] = None):
+        """
+        Pushes the given objects to Odoo. Synced objects are only updated with
+        one `write` when their whole payload is identical, e.g. records with
+        only defaults and company mapped, objects with distinct values still
+        get a `write` each. New objects are created one by one, as are all
+        objects of models overriding `o_update_or_create`.
+        """
+        batchable = self.model.o_update_or_create is OdooMixin.o_update_or_create
+        dbs = {}
+        for chunk in self._o_job_chunks(pks, job):
+            writes = {}
+            for instance in chunk:
+                if not batchable or not instance.o_id:
+                    instance.o_update_or_create()
+                    continue
+
+                kwargs = instance.o_kwargs
+                key = (
+                    instance.o_db,
+                    json.dumps(kwargs, sort_keys=True, default=str),
+                )
+                writes.setdefault(key, (kwargs, []))[1].append(instance)
+
+            for (connection, _), (kwargs, instances) in writes.items():
+                _bulk_connect(dbs, connection).execute(
+                    self.model.o_model,
+                    "write",
+                    [instance.o_id for instance in instances],
+                    kwargs,
+                )
+                for instance in instances:
+                    instance.o_updated = timezone.now()
+                    instance.save()
+
+    def sync(self, company: Company, kind: str = "data") -> SyncJob:
+        """
+        Syncs this model from Odoo as a resumable job.
+
+        Resumes the latest unfinished job for the model and company from its
+        checkpoint, or starts a new one.
+
+        :param company:
+        :param kind: `SyncJob.Kind` - load data or images
+        :return: finished job, or the job that is already running
+        """
+        jobs = SyncJob.objects.filter(
+            o_company=company, model=self.model._meta.label, kind=kind
+        ).order_by("-created")
+        with transaction.atomic():
+            # Overlapping syncs of the company wait here for each other
+            Company.objects.select_for_update().filter(pk=company.pk).first()
+
+            running = jobs.running().first()
+            if running:
+                return running
+
+            job = jobs.resumable().first()
+            if not job:
+                job = SyncJob.objects.create(
+                    o_company=company,
+                    model=self.model._meta.label,
+                    kind=kind,
+                    status=SyncJob.Status.RUNNING,
+                )
+            elif not job.claim():
+                return job
+
+        job.run()
+        return job
+
 
 class Connection(models.Model):
     _rpc = None
     url = models.CharField(max_length=256)
+    # Token Odoo automated actions send with change notifications, empty disables them
+    webhook_token = models.CharField(max_length=64, blank=True, default="")
 
     @property
     def env(self, *args, **kwargs):
         self.connect()
         return self._rpc.env(*args, **kwargs)
 
-    def connect(self):
+    @property
+    def limiter(self):
+        return ConnectionLimiter(self.pk)
+
+    def connect(self, lane=Lane.INTERACTIVE):
+        """
+        :param lane: `Lane` of the calls, bulk syncs yield to interactive calls
+        :return: odoorpc connection limiting concurrent `execute` calls
+        """
+        odoo_url = urlparse(self.url)
         if not self._rpc:
-            odoo_url = urlparse(self.url)
             self._rpc = odoorpc.ODOO(
                 host=odoo_url.hostname, port=odoo_url.port, protocol=odoo_url.scheme
             )
@@ -167,7 +548,7 @@ class Connection(models.Model):
             self._rpc.login(
                 odoo_url.path[1:], login=odoo_url.username, password=odoo_url.password
             )
-        return self._rpc
+        return LimitedODOO(self._rpc, self.limiter, lane)
 
     def __str__(self):
         return str(self.id)
@@ -236,11 +617,11 @@ class OdooMixin(models.Model):
         """
         db = db or self.o_db
         kwargs = {**self.o_kwargs, **kwargs}
-        model = db.env[self.o_model]
 
         self.o_id = self.o_id or self.o_search_id()
 
         if not self.o_id:
+            model = db.env[self.o_model]
             kwargs = {**self.o_create_defaults, **kwargs}
             self.o_id = (
                 model.with_context(self.o_create_context).create(kwargs)
@@ -256,8 +637,8 @@ class OdooMixin(models.Model):
             #     }
             # )
         else:
-            record = model.browse([self.o_id])[0]
-            record.write(kwargs)
+            # Write by id, browsing would read the whole record first
+            db.connect().execute(self.o_model, "write", [self.o_id], kwargs)
         self.o_updated = timezone.now()
         self.save()
 
@@ -297,6 +678,9 @@ class OdooMixin(models.Model):
         abstract = True
 
 
+COMPANY_CACHE_GENERATION_KEY = "df_odoo:company:generation"
+
+
 class Company(OdooMixin):
     o_model = "res.company"
     o_field_map = {"website": "website_url", "city": "city", "street": "street"}
@@ -311,12 +695,31 @@ class Company(OdooMixin):
 
     def login_user(self, user, redirect):
         customer = Customer.objects.get_or_create(user=user, o_company=self)[0]
-        customer.o_update_or_create()
-        token = customer.o_login()
+        token = customer.o_sso_login()
         return (
             f"{self.website_url}/sso/redirect?token={token}&redirect={redirect or '/'}"
         )
 
+    @staticmethod
+    def cache_key(slug, user=None):
+        """
+        :return: cache key of the serialized company. The current company (`_`)
+            is cached per user, invalidating replaces the generation of these keys.
+            Slugs come from the URL and are hashed to keep keys memcached-safe
+        """
+        if slug == "_":
+            generation = cache.get_or_set(
+                COMPANY_CACHE_GENERATION_KEY, lambda: uuid4().hex, None
+            )
+            return f"df_odoo:company:_:{generation}:{user.pk}"
+        digest = hashlib.md5(str(slug).encode()).hexdigest()  # noqa: S324
+        return f"df_odoo:company:{digest}"
+
+    def invalidate_cache(self):
+        # Plain sets, so an evicted key or a dummy cache never fails a save
+        cache.delete(self.cache_key(self.slug))
+        cache.set(COMPANY_CACHE_GENERATION_KEY, uuid4().hex, None)
+
     def __str__(self):
         return self.slug
 
@@ -324,6 +727,208 @@ class Company(OdooMixin):
         verbose_name_plural = "companies"
 
 
+class OdooImage(models.Model):
+    """
+    Image loaded from Odoo, stored once per content hash and shared by all
+    instances with this image when `CONTENT_ADDRESSED_IMAGES` is enabled.
+
+    Only image fields using the same storage share the files, others still get
+    a file per instance. Instances point to the shared file, so deleting the file through one instance's image
+    field (e.g. `instance.image.delete()`) removes it for every instance with
+    this image. Clear the field instead, and delete unused `OdooImage` rows.
+    """
+
+    hash = models.CharField(max_length=32, unique=True)
+    image = models.FileField(upload_to="odoo/images/")
+    created = models.DateTimeField(auto_now_add=True)
+
+    @classmethod
+    def store(cls, image_hash, image_bytes) -> OdooImage:
+        """
+        Uploads an image missing from the hash index.
+
+        :return: stored image with this hash
+        """
+        image = cls(hash=image_hash)
+        image.image.save(f"{image_hash}.jpg", ContentFile(image_bytes), save=False)
+        try:
+            with transaction.atomic():
+                image.save()
+        except IntegrityError:
+            # Stored by a concurrent sync meanwhile
+            image.image.delete(save=False)
+            image = cls.objects.get(hash=image_hash)
+        return image
+
+    def __str__(self):
+        return self.hash
+
+
+class SyncJobQuerySet(models.QuerySet):
+    def _lease_start(self):
+        return timezone.now() - timedelta(seconds=api_settings.SYNC_JOB_LEASE)
+
+    def running(self):
+        """
+        Running jobs refresh `updated` after every chunk, a job silent for
+        `SYNC_JOB_LEASE` seconds died with its worker
+        """
+        return self.filter(
+            status=SyncJob.Status.RUNNING, updated__gte=self._lease_start()
+        )
+
+    def resumable(self):
+        return self.filter(
+            models.Q(status__in=[SyncJob.Status.PENDING, SyncJob.Status.FAILED])
+            | models.Q(status=SyncJob.Status.RUNNING, updated__lt=self._lease_start())
+        )
+
+    def queue_changes(self, company: Company, model: str, kind: str, odoo_ids):
+        """
+        Stores Odoo ids notified as changed in the pending job of the model, so
+        they survive until the job runs.
+
+        :param model: label of the synced model
+        :param kind: `SyncJob.Kind.CHANGES` or `SyncJob.Kind.UNLINK`
+        :return: pending job with the ids
+        """
+        with transaction.atomic():
+            # Concurrent notifications of the company wait here for each other
+            Company.objects.select_for_update().filter(pk=company.pk).first()
+
+            job = (
+                self.select_for_update()
+                .filter(
+                    o_company=company,
+                    model=model,
+                    kind=kind,
+                    status=SyncJob.Status.PENDING,
+                )
+                .first()
+            )
+            if not job:
+                return self.create(
+                    o_company=company,
+                    model=model,
+                    kind=kind,
+                    object_ids=sorted(set(odoo_ids)),
+                )
+
+            job.object_ids = sorted(set(job.object_ids) | set(odoo_ids))
+            job.save(update_fields=["object_ids", "updated"])
+            return job
+
+
+class SyncJob(models.Model):
+    """
+    A resumable run of `load_odoo_to_django` or `load_odoo_images`, of an
+    admin `o_load`/`o_update` action over `object_ids`, or of the changes
+    Odoo notified us about.
+
+    `checkpoint` is the last processed Odoo id (the number of processed
+    `object_ids` for admin action jobs), so a failed job continues from there
+    instead of starting over.
+    """
+
+    class Kind(models.TextChoices):
+        DATA = "data", "Data"
+        IMAGES = "images", "Images"
+        LOAD = "load", "Load objects"
+        UPDATE = "update", "Update objects"
+        CHANGES = "changes", "Odoo changes"
+        UNLINK = "unlink", "Odoo deletions"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        FAILED = "failed", "Failed"
+        DONE = "done", "Done"
+
+    o_company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        related_name="sync_jobs",
+        null=True,
+        blank=True,
+    )
+    # Label of the synced model, e.g. `cafes.Product`
+    model = models.CharField(max_length=128)
+    # Django pks of the objects of admin action jobs, Odoo ids of change jobs
+    object_ids = models.JSONField(default=list, blank=True)
+    kind = models.CharField(max_length=16, choices=Kind.choices, default=Kind.DATA)
+    status = models.CharField(
+        max_length=16, choices=Status.choices, default=Status.PENDING
+    )
+    checkpoint = models.PositiveBigIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    objects = SyncJobQuerySet.as_manager()
+
+    def claim(self):
+        """
+        Marks a resumable job as running, only one of concurrent callers succeeds.
+
+        :return: whether the job was claimed
+        """
+        claimed = (
+            SyncJob.objects.resumable()
+            .filter(pk=self.pk)
+            .update(status=self.Status.RUNNING, updated=timezone.now())
+        )
+        if claimed:
+            self.status = self.Status.RUNNING
+        return bool(claimed)
+
+    def run(self):
+        queryset = apps.get_model(self.model).objects
+        self.status = self.Status.RUNNING
+        self.error = ""
+        self.save(update_fields=["status", "error", "updated"])
+        try:
+            if self.kind == self.Kind.IMAGES:
+                queryset.load_odoo_images(self.o_company, job=self)
+            elif self.kind == self.Kind.LOAD:
+                queryset.o_load_objects(self.object_ids, job=self)
+            elif self.kind == self.Kind.UPDATE:
+                queryset.o_update_objects(self.object_ids, job=self)
+            elif self.kind == self.Kind.CHANGES:
+                queryset.load_odoo_ids(self.o_company, self.object_ids, job=self)
+            elif self.kind == self.Kind.UNLINK:
+                queryset.delete_odoo_ids(self.o_company, self.object_ids, job=self)
+            else:
+                queryset.load_odoo_to_django(self.o_company, job=self)
+        except Exception as e:
+            self.status = self.Status.FAILED
+            self.error = repr(e)
+            self.save(update_fields=["status", "error", "updated"])
+            raise
+        self.status = self.Status.DONE
+        self.save(update_fields=["status", "updated"])
+
+    def start(self, remaining):
+        self.total = self.processed + remaining
+        self.save(update_fields=["total", "updated"])
+
+    def advance(self, count, checkpoint=None):
+        if checkpoint is not None:
+            self.checkpoint = checkpoint
+        self.processed += count
+        self.save(update_fields=["checkpoint", "processed", "updated"])
+
+    @property
+    def progress(self):
+        if not self.total:
+            return 100 if self.status == self.Status.DONE else 0
+        return round(self.processed * 100 / self.total)
+
+    def __str__(self):
+        return f"{self.model} {self.kind} ({self.o_company_id}): {self.status}"
+
+
 class OdooCompanyModelMixin(OdooMixin):
     o_company = models.ForeignKey(Company, on_delete=models.CASCADE)
 
@@ -348,6 +953,8 @@ class Customer(OdooCompanyModelMixin):
     o_create_defaults = {"sel_groups_1_8_9": 9, "active": True}
     o_create_context = {"no_reset_password": True}
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # Hash of the profile last pushed to odoo, so unchanged profiles aren't pushed
+    o_profile_hash = models.CharField(max_length=32, null=True, editable=False)
 
     @property
     def name(self):
@@ -357,10 +964,38 @@ class Customer(OdooCompanyModelMixin):
     def email(self):
         return self.user.email
 
+    @property
+    def o_profile_hash_value(self):
+        return hashlib.md5(  # noqa: S324
+            json.dumps(self.o_kwargs, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def o_update_or_create(self, db=None, **kwargs):
+        self.o_profile_hash = self.o_profile_hash_value
+        super().o_update_or_create(db=db, **kwargs)
+
     def o_login(self):
+        if not self.o_id:
+            raise ValueError(f"{self.__str__()}: can not login user without o_id")
+
+        key = str(uuid4())
+        self.o_db.connect().execute(
+            self.o_model, "write", [self.o_id], {"sso_key": key}
+        )
+        return key
+
+    def o_sso_login(self):
+        """
+        Issues an SSO key with a single RPC for synced customers: the key is
+        written by id, together with the profile if it changed since the last push.
+
+        :return: SSO key
+        """
+        if self.o_id and self.o_profile_hash == self.o_profile_hash_value:
+            return self.o_login()
+
         key = str(uuid4())
-        record = self.o_retrieve()
-        record.write({"sso_key": key})
+        self.o_update_or_create(sso_key=key)
         return key
 
     def o_search_id(self):
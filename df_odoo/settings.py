@@ -1,6 +1,41 @@
 from django.conf import settings
 from rest_framework.settings import APISettings
 
-DEFAULTS = {}
+DEFAULTS = {
+    # Number of Odoo records read and saved per checkpointed sync chunk
+    "SYNC_CHUNK_SIZE": 500,
+    # Images are large, so they are read from Odoo in smaller chunks
+    "SYNC_IMAGE_CHUNK_SIZE": 50,
+    # Seconds without progress after which a running sync job counts as dead
+    "SYNC_JOB_LEASE": 600,
+    # Store images once per content hash and share them between instances,
+    # deleting an instance's image file then removes it for all of them
+    "CONTENT_ADDRESSED_IMAGES": False,
+    # Seconds to collect Odoo change notifications before loading the records
+    "WEBHOOK_COALESCE_WINDOW": 2,
+    # Seconds to collect orders of a table into one POS notification
+    "POS_NOTIFICATION_WINDOW": 2,
+    # Seconds serialized companies are cached for `CompanyViewSet.retrieve`
+    "COMPANY_CACHE_TIMEOUT": 300,
+    # Adaptive limit of concurrent RPC calls per Odoo connection
+    "RPC_LIMIT_INITIAL": 4,
+    "RPC_LIMIT_MIN": 1,
+    "RPC_LIMIT_MAX": 32,
+    # Multiplier applied to the limit after a slow or failed call
+    "RPC_LIMIT_DECREASE": 0.5,
+    # Seconds between two decreases of the limit, one per window of calls
+    "RPC_DECREASE_INTERVAL": 5,
+    # Calls slower than this multiple of the fastest recent call of the same
+    # model and method count as overload
+    "RPC_LATENCY_TOLERANCE": 2.0,
+    # Seconds of calls the fastest latency is taken from, spanning one to two windows
+    "RPC_BASELINE_WINDOW": 600,
+    # Share of the limit bulk syncs may use
+    "RPC_BULK_SHARE": 0.5,
+    # Seconds to wait for a free slot before calling anyway
+    "RPC_ACQUIRE_TIMEOUT": 30,
+    # Seconds after which the slot of a call expires, e.g. when its worker died
+    "RPC_SLOT_LEASE": 300,
+}
 
 api_settings = APISettings(getattr(settings, "DF_ODOO", None), DEFAULTS)
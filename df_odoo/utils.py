@@ -2,7 +2,9 @@ import math
 
 from rest_framework.exceptions import ValidationError
 
+from df_odoo.dispatcher import Coalescer, forget_connection, get_connection
 from df_odoo.models import Customer
+from df_odoo.settings import api_settings
 
 
 def get_active_session_id(db, cafe_o_id) -> int:
@@ -131,21 +133,50 @@ def create_pos_order(db, order):
             price_unit=str(line.price_unit),
         )
 
-    db.execute_kw(
-        "pos.config",
-        "send_to_all_poses",
-        [
-            "table.order",
-            {
-                "table_order_display": {
-                    "table_order_message": f"New order, table {table.title}",
-                },
-                "action": "update_table_order",
-            },
-        ],
+    pos_notifications.add(
+        (order.o_company.o_db_id, order.cafe.o_id, table.title if table else ""),
+        order.id,
     )
 
 
+def send_pos_notification(key, order_ids):
+    """
+    Broadcasts one notification to the POS for all orders of a table
+    collected by `pos_notifications`
+    """
+    connection_id, _, table_title = key
+    message = (
+        f"New order, table {table_title}"
+        if len(order_ids) == 1
+        else f"{len(order_ids)} new orders, table {table_title}"
+    )
+    # Request connections aren't shared with the dispatcher thread
+    db = get_connection(connection_id).connect()
+    try:
+        db.execute_kw(
+            "pos.config",
+            "send_to_all_poses",
+            [
+                "table.order",
+                {
+                    "table_order_display": {
+                        "table_order_message": message,
+                    },
+                    "action": "update_table_order",
+                },
+            ],
+        )
+    except Exception:
+        # Log in again next time
+        forget_connection(connection_id)
+        raise
+
+
+pos_notifications = Coalescer(
+    send_pos_notification, lambda: api_settings.POS_NOTIFICATION_WINDOW
+)
+
+
 def check_sale_order_is_paid(db, sale_order_id):
     return db.execute("sale.order", "stripe_check_payment_status", [sale_order_id])
 
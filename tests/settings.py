@@ -106,3 +106,6 @@ SPECTACULAR_SETTINGS = {
 DF_ODOO = {
     "TEST_SETTING": "test-replaced",
 }
+
+# df_odoo ships without migrations, tables are created from models in tests
+MIGRATION_MODULES = {"df_odoo": None}
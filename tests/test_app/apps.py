@@ -3,3 +3,5 @@ from django.apps import AppConfig
 
 class TestAppConfig(AppConfig):
     name = "tests.test_app"
+    # Synced models of df_odoo reference `cafes.Product`
+    label = "cafes"
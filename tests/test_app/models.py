@@ -0,0 +1,14 @@
+from django.db import models
+
+from df_odoo.models import OdooCompanyModelMixin
+
+
+class Product(OdooCompanyModelMixin):
+    o_model = "product.template"
+    o_field_map = {"name": "title", "description": "description"}
+    o_image_field = "image_1920"
+    d_image_field = "image"
+
+    title = models.CharField(max_length=64, blank=True, default="")
+    description = models.TextField(blank=True, default="")
+    image = models.FileField(blank=True)
@@ -0,0 +1,115 @@
+import pytest
+from django.contrib.auth import get_user_model
+
+from df_odoo.models import Connection, Customer, SyncJob
+from df_odoo.settings import api_settings
+
+from .models import Product
+
+
+@pytest.fixture
+def products(odoo, company):
+    for o_id in range(1, 5):
+        odoo.records[o_id] = {"id": o_id, "name": f"Product {o_id}", "description": ""}
+    return [
+        Product.objects.create(o_id=o_id, o_company=company) for o_id in range(1, 5)
+    ]
+
+
+def queue(objects, kind):
+    return SyncJob.objects.create(
+        model=objects[0]._meta.label,
+        kind=kind,
+        object_ids=[str(instance.pk) for instance in objects],
+    )
+
+
+def test_load_reads_all_objects_at_once(odoo, products):
+    job = queue(products, SyncJob.Kind.LOAD)
+    job.run()
+
+    assert [args[0] for args in odoo.reads] == [[1, 2, 3, 4]]
+    assert list(Product.objects.order_by("o_id").values_list("title", flat=True)) == [
+        f"Product {o_id}" for o_id in range(1, 5)
+    ]
+    assert (job.status, job.processed, job.total) == (SyncJob.Status.DONE, 4, 4)
+
+
+def test_update_batches_equal_values(odoo, products):
+    queue(products, SyncJob.Kind.UPDATE).run()
+
+    writes = [args for _, method, args in odoo.calls if method == "write"]
+    assert len(writes) == 1
+    assert writes[0][0] == [1, 2, 3, 4]
+
+
+def test_update_uses_model_override(odoo, company):
+    user = get_user_model().objects.create(username="user", email="user@example.com")
+    customer = Customer.objects.create(user=user, o_company=company, o_id=3)
+
+    queue([customer], SyncJob.Kind.UPDATE).run()
+
+    customer.refresh_from_db()
+    assert customer.o_profile_hash == customer.o_profile_hash_value
+
+
+def test_update_searches_unsynced_objects_once(odoo, products, monkeypatch):
+    searches = []
+
+    class Model:
+        def create(self, kwargs):
+            return 9
+
+    def o_search_id(self):
+        searches.append(self.pk)
+        return self.o_id
+
+    monkeypatch.setattr(Product, "o_search_id", o_search_id)
+    monkeypatch.setattr(
+        Connection, "env", property(lambda self: {"product.template": Model()})
+    )
+    Product.objects.filter(pk=products[0].pk).update(o_id=None)
+
+    queue(products, SyncJob.Kind.UPDATE).run()
+
+    assert searches == [products[0].pk]
+    assert Product.objects.filter(o_id=9).exists()
+
+
+def test_resume_continues_after_checkpoint(odoo, products, monkeypatch):
+    monkeypatch.setattr(api_settings, "SYNC_CHUNK_SIZE", 2, raising=False)
+    odoo.fail_on_read = 1
+    job = queue(products, SyncJob.Kind.LOAD)
+    with pytest.raises(OSError):
+        job.run()
+    assert job.checkpoint == 2
+
+    # An already loaded object is deleted before the job is resumed
+    products[0].delete()
+    odoo.fail_on_read = None
+    odoo.calls.clear()
+    job.run()
+
+    assert [args[0] for args in odoo.reads] == [[3, 4]]
+    assert (job.processed, job.total) == (4, 4)
+
+
+def test_running_jobs_are_not_resumed(odoo, company, products):
+    job = SyncJob.objects.create(
+        o_company=company, model="cafes.Product", status=SyncJob.Status.RUNNING
+    )
+
+    assert not SyncJob.objects.resumable().exists()
+    assert Product.objects.sync(company) == job
+    assert not odoo.reads
+
+
+def test_dead_running_jobs_are_resumed(odoo, company, products, monkeypatch):
+    monkeypatch.setattr(api_settings, "SYNC_JOB_LEASE", -1, raising=False)
+    job = SyncJob.objects.create(
+        o_company=company, model="cafes.Product", status=SyncJob.Status.RUNNING
+    )
+
+    assert Product.objects.sync(company) == job
+    job.refresh_from_db()
+    assert job.status == SyncJob.Status.DONE
@@ -0,0 +1,97 @@
+import warnings
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.cache.backends.base import CacheKeyWarning
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from df_odoo.drf.viewsets import CompanyViewSet
+
+retrieve = CompanyViewSet.as_view({"get": "retrieve"})
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def user(db):
+    return get_user_model().objects.create(username="user")
+
+
+def get(user, slug, **headers):
+    request = APIRequestFactory().get("/", **headers)
+    force_authenticate(request, user)
+    return retrieve(request, slug=slug)
+
+
+def test_retrieve_returns_etag(user, company):
+    response = get(user, "acme")
+
+    assert response.status_code == 200
+    assert response.data["slug"] == "acme"
+    assert response["ETag"]
+    assert not response.has_header("Last-Modified")
+
+
+def test_retrieve_not_modified(user, company, django_assert_num_queries):
+    etag = get(user, "acme")["ETag"]
+
+    with django_assert_num_queries(0):
+        response = get(user, "acme", HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+
+
+def test_retrieve_ignores_if_modified_since(user, company):
+    get(user, "acme")
+
+    response = get(user, "acme", HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT")
+
+    assert response.status_code == 200
+
+
+def test_save_invalidates_cache(user, company, django_assert_num_queries):
+    get(user, "acme")
+    get(user, "_")
+
+    company.name = "Acme"
+    company.save()
+
+    with django_assert_num_queries(1):
+        assert get(user, "acme").status_code == 200
+    with django_assert_num_queries(1):
+        assert get(user, "_").status_code == 200
+
+
+def test_current_company_is_cached_per_user(user, company, django_assert_num_queries):
+    get(user, "_")
+    other = get_user_model().objects.create(username="other")
+
+    with django_assert_num_queries(1):
+        assert get(other, "_").data["slug"] == "acme"
+    with django_assert_num_queries(0):
+        assert get(user, "_").data["slug"] == "acme"
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+)
+def test_save_without_cache(user, company):
+    company.name = "Acme"
+    company.save()
+
+    assert get(user, "_").data["slug"] == "acme"
+
+
+@pytest.mark.parametrize("slug", ["no such company", "x" * 300])
+def test_retrieve_unsafe_slug_not_found(user, company, slug):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", CacheKeyWarning)
+        response = get(user, slug)
+
+    assert response.status_code == 404
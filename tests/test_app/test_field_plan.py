@@ -0,0 +1,20 @@
+from df_odoo.models import get_field_plan
+
+from .models import Product
+
+
+def test_rows_convert_odoo_values():
+    plan = get_field_plan(Product)
+    odoo_models = [
+        {"id": 1, "name": False, "description": [5, "Tea"]},
+        {"id": 2, "name": "Coffee", "description": []},
+    ]
+
+    assert plan.rows(odoo_models, {}, {"o_updated": None}) == [
+        {"title": "", "description": "Tea", "o_updated": None},
+        {"title": "Coffee", "description": "", "o_updated": None},
+    ]
+
+
+def test_plan_is_compiled_once():
+    assert get_field_plan(Product) is get_field_plan(Product)
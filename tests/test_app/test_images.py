@@ -0,0 +1,89 @@
+import base64
+import hashlib
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+
+from df_odoo.models import OdooImage
+from df_odoo.settings import api_settings
+
+from .models import Product
+
+TEA = b"tea image"
+COFFEE = b"coffee image"
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path, monkeypatch):
+    settings.MEDIA_ROOT = tmp_path
+    monkeypatch.setattr(api_settings, "CONTENT_ADDRESSED_IMAGES", True, raising=False)
+    return tmp_path
+
+
+def files(media_root):
+    return sorted(
+        str(path.relative_to(media_root))
+        for path in media_root.rglob("*")
+        if path.is_file()
+    )
+
+
+@pytest.fixture
+def products(odoo, company):
+    for o_id, image in ((1, TEA), (2, TEA), (3, COFFEE)):
+        odoo.records[o_id] = {"id": o_id, "image_1920": base64.b64encode(image)}
+    return [Product.objects.create(o_id=o_id, o_company=company) for o_id in (1, 2, 3)]
+
+
+def test_images_are_stored_once_per_hash(media_root, products):
+    Product.objects.load_odoo_images(products[0].o_company)
+
+    tea_hash = hashlib.md5(TEA).hexdigest()  # noqa: S324
+    images = dict(Product.objects.order_by("o_id").values_list("o_id", "image"))
+    assert images[1] == images[2] == f"odoo/images/{tea_hash}.jpg"
+    assert images[3] != images[1]
+    assert OdooImage.objects.count() == 2
+    assert len(files(media_root)) == 2
+
+
+def test_images_are_shared_across_companies(media_root, products, odoo, company):
+    Product.objects.load_odoo_images(company)
+    company.pk = None
+    company.slug = "other"
+    company.save()
+    Product.objects.create(o_id=1, o_company=company)
+
+    Product.objects.load_odoo_images(company)
+
+    assert OdooImage.objects.count() == 2
+    assert len(files(media_root)) == 2
+
+
+def test_per_instance_files_are_removed(media_root, products):
+    products[0].image.save("image.jpg", ContentFile(b"old"))
+
+    Product.objects.load_odoo_images(products[0].o_company)
+
+    assert "image.jpg" not in files(media_root)
+    assert len(files(media_root)) == 2
+
+
+def test_store_falls_back_to_concurrent_upload(db, media_root):
+    image_hash = hashlib.md5(TEA).hexdigest()  # noqa: S324
+    stored = OdooImage.store(image_hash, TEA)
+
+    image = OdooImage.store(image_hash, TEA)
+
+    assert image.pk == stored.pk
+    assert files(media_root) == [stored.image.name]
+
+
+def test_other_storage_gets_file_per_instance(media_root, products, monkeypatch):
+    storage = FileSystemStorage(location=media_root / "products")
+    monkeypatch.setattr(Product._meta.get_field("image"), "storage", storage)
+
+    Product.objects.load_odoo_images(products[0].o_company)
+
+    assert not OdooImage.objects.exists()
+    assert len(files(media_root / "products")) == 3
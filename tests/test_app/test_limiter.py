@@ -0,0 +1,149 @@
+import time
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from df_odoo.limiter import ConnectionLimiter, Lane
+from df_odoo.settings import api_settings
+
+
+@pytest.fixture
+def limiter():
+    cache.clear()
+    return ConnectionLimiter("test")
+
+
+def slots(limiter):
+    return cache.get_many([limiter._key(f"slot:{i}") for i in range(32)])
+
+
+def test_limit_grows_by_one_slot_per_window(limiter):
+    for _ in range(4):
+        limiter.release(limiter.acquire(), 0.1)
+
+    assert limiter.limit(Lane.INTERACTIVE) == pytest.approx(5, abs=0.1)
+    assert not slots(limiter)
+
+
+def test_limit_is_cut_once_per_window(limiter):
+    limiter.release(None, 0.1)
+    limit = limiter.limit(Lane.INTERACTIVE)
+
+    for _ in range(4):
+        limiter.release(None, 10)
+
+    assert limiter.limit(Lane.INTERACTIVE) == pytest.approx(limit / 2, abs=0.01)
+
+
+def test_failed_call_cuts_limit(limiter):
+    limiter.release(None, 0.1, failed=True)
+
+    assert limiter.limit(Lane.INTERACTIVE) == 2
+
+
+def test_limit_is_judged_against_lane_latency(limiter):
+    limiter.release(None, 0.1)
+    # Bulk reads are slow but steady
+    for _ in range(5):
+        limiter.release(None, 5, lane=Lane.BULK)
+
+    assert limiter.limit(Lane.BULK) > 4
+
+
+def test_slow_bulk_calls_keep_interactive_capacity(limiter):
+    limiter.release(None, 1, lane=Lane.BULK)
+    limiter.release(None, 10, lane=Lane.BULK)
+
+    assert limiter.limit(Lane.BULK) < 4
+    assert limiter.limit(Lane.INTERACTIVE) == 4
+
+
+def test_gradual_slowdown_cuts_limit(limiter):
+    for latency in (1.0, 1.2, 1.4, 1.6, 1.8, 2.0):
+        limiter.release(None, latency, operation="sale.order:read")
+    limit = limiter.limit(Lane.INTERACTIVE)
+
+    limiter.release(None, 2.2, operation="sale.order:read")
+
+    assert limiter.limit(Lane.INTERACTIVE) == pytest.approx(limit / 2, abs=0.01)
+
+
+def test_latency_is_judged_per_operation(limiter):
+    for _ in range(5):
+        limiter.release(None, 0.05, operation="product.template:search")
+        limiter.release(None, 1, operation="pos.order:create_from_ui")
+
+    assert limiter.limit(Lane.INTERACTIVE) > 4
+
+
+def test_baseline_follows_latency_after_two_windows(limiter, monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("df_odoo.limiter.time.time", lambda: now)
+    limiter.release(None, 0.1)
+    now += api_settings.RPC_BASELINE_WINDOW
+    limiter.release(None, 0.15)
+    now += api_settings.RPC_BASELINE_WINDOW
+    limit = limiter.limit(Lane.INTERACTIVE)
+
+    limiter.release(None, 0.25)
+
+    assert limiter.limit(Lane.INTERACTIVE) > limit
+
+
+def test_bulk_lane_gets_share_of_slots(limiter):
+    assert limiter._capacity(Lane.INTERACTIVE) == 4
+    assert limiter._capacity(Lane.BULK) == 2
+
+
+def test_bulk_lane_yields_to_waiting_interactive_calls(limiter):
+    cache.set(limiter._key("waiting"), 1)
+
+    assert limiter._capacity(Lane.BULK) == 0
+    assert limiter._capacity(Lane.INTERACTIVE) == 4
+
+
+def test_acquire_waits_for_free_slot(limiter, monkeypatch):
+    taken = [limiter.acquire() for _ in range(4)]
+
+    def release_slot(delay):
+        assert cache.get(limiter._key("waiting"))
+        limiter.release(taken.pop(), 0.1)
+
+    monkeypatch.setattr("df_odoo.limiter.time.sleep", release_slot)
+
+    assert limiter.acquire()
+    assert len(taken) == 3
+    assert len(slots(limiter)) == 4
+
+
+def test_slots_of_crashed_calls_expire(limiter, monkeypatch):
+    for _ in range(4):
+        limiter.acquire()
+    assert limiter._take_slot(Lane.INTERACTIVE) is None
+
+    later = time.time() + api_settings.RPC_SLOT_LEASE + 1
+    monkeypatch.setattr("django.core.cache.backends.locmem.time.time", lambda: later)
+
+    assert limiter._take_slot(Lane.INTERACTIVE)
+
+
+def test_expired_slot_taken_by_another_call_is_kept(limiter):
+    slot = limiter.acquire()
+    cache.delete(slot[0])
+    other = limiter.acquire()
+
+    limiter.release(slot, 0.1)
+
+    assert other[0] == slot[0]
+    assert cache.get(other[0]) == other[1]
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+)
+def test_limiter_without_cache(limiter):
+    limiter.release(limiter.acquire(), 0.1)
+    limiter.release(limiter.acquire(), 10)
+
+    assert limiter.limit(Lane.INTERACTIVE) == 4
@@ -0,0 +1,46 @@
+import pytest
+from django.contrib.auth import get_user_model
+
+from df_odoo.models import Customer
+
+
+@pytest.fixture
+def customer(company):
+    user = get_user_model().objects.create(
+        username="user", email="user@example.com", first_name="Ann"
+    )
+    return Customer.objects.create(user=user, o_company=company)
+
+
+def test_login_requires_o_id(odoo, customer):
+    with pytest.raises(ValueError):
+        customer.o_login()
+
+    assert not odoo.calls
+
+
+def test_login_writes_sso_key_by_id(odoo, customer):
+    customer.o_id = 3
+    customer.o_update_or_create()
+    odoo.calls.clear()
+
+    url = customer.o_company.login_user(customer.user, "/shop")
+
+    assert odoo.calls == [
+        ("res.users", "write", ([3], {"sso_key": odoo.records[3]["sso_key"]}))
+    ]
+    assert f"token={odoo.records[3]['sso_key']}&redirect=/shop" in url
+
+
+def test_login_pushes_changed_profile_with_sso_key(odoo, customer):
+    customer.o_id = 3
+    customer.o_update_or_create()
+    customer.user.first_name = "Bob"
+    customer.user.save()
+    odoo.calls.clear()
+
+    customer.o_company.login_user(customer.user, "/")
+
+    assert len(odoo.calls) == 1
+    assert odoo.records[3]["name"] == "Bob "
+    assert odoo.records[3]["sso_key"]
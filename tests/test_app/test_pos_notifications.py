@@ -0,0 +1,97 @@
+import threading
+
+import pytest
+
+from df_odoo import dispatcher
+from df_odoo.dispatcher import Coalescer
+from df_odoo.models import Connection
+from df_odoo.utils import send_pos_notification
+
+
+@pytest.fixture(autouse=True)
+def no_shared_connections(monkeypatch):
+    monkeypatch.setattr(dispatcher, "_connections", {})
+
+
+@pytest.fixture
+def connects(odoo, monkeypatch):
+    connections = []
+
+    def connect(self, lane=None):
+        connections.append(self)
+        return odoo
+
+    monkeypatch.setattr(Connection, "connect", connect)
+    return connections
+
+
+def notifications(odoo):
+    return [
+        args[1]["table_order_display"]["table_order_message"]
+        for _, method, args in odoo.calls
+        if method == "send_to_all_poses"
+    ]
+
+
+@pytest.mark.parametrize(
+    "order_ids, message",
+    [([1], "New order, table 5"), ([1, 2, 3], "3 new orders, table 5")],
+)
+def test_send_pos_notification(odoo, company, order_ids, message):
+    send_pos_notification((company.o_db_id, 2, "5"), order_ids)
+
+    assert notifications(odoo) == [message]
+
+
+def test_notifications_share_connection(connects, company):
+    send_pos_notification((company.o_db_id, 2, "5"), [1])
+    send_pos_notification((company.o_db_id, 2, "5"), [2])
+
+    assert len(connects) == 2
+    assert connects[0] is connects[1]
+
+
+def test_changed_connection_url_replaces_connection(connects, company):
+    send_pos_notification((company.o_db_id, 2, "5"), [1])
+    Connection.objects.filter(pk=company.o_db_id).update(url="http://a:b@other/odoo")
+    send_pos_notification((company.o_db_id, 2, "5"), [2])
+
+    assert connects[0] is not connects[1]
+    assert connects[1].url == "http://a:b@other/odoo"
+
+
+def test_failed_notification_drops_connection(connects, odoo, company, monkeypatch):
+    def execute_kw(*args):
+        raise OSError("timed out")
+
+    monkeypatch.setattr(odoo, "execute_kw", execute_kw)
+    with pytest.raises(OSError):
+        send_pos_notification((company.o_db_id, 2, "5"), [1])
+
+    assert not dispatcher._connections
+
+
+def test_coalescer_merges_items_within_window():
+    flushed = threading.Event()
+    calls = []
+
+    def callback(key, items):
+        calls.append((key, items))
+        flushed.set()
+
+    coalescer = Coalescer(callback, 0.05)
+    coalescer.add("table", 1)
+    coalescer.add("table", 2, 3)
+
+    assert not calls
+    assert flushed.wait(1)
+    assert calls == [("table", [1, 2, 3])]
+
+
+def test_coalescer_without_window_runs_synchronously():
+    calls = []
+
+    coalescer = Coalescer(lambda key, items: calls.append((key, items)), 0)
+    coalescer.add("table", 1)
+
+    assert calls == [("table", [1])]
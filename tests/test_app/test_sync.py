@@ -0,0 +1,83 @@
+import pytest
+
+from df_odoo.models import SyncJob
+from df_odoo.settings import api_settings
+
+from .models import Product
+
+
+@pytest.fixture(autouse=True)
+def chunk_size(monkeypatch):
+    monkeypatch.setattr(api_settings, "SYNC_CHUNK_SIZE", 2, raising=False)
+
+
+@pytest.fixture
+def products(odoo):
+    for o_id in range(1, 6):
+        odoo.records[o_id] = {
+            "id": o_id,
+            "name": f"Product {o_id}",
+            "description": False,
+        }
+
+
+def test_sync_loads_in_chunks(odoo, company, products):
+    job = Product.objects.sync(company)
+
+    assert [args[0] for args in odoo.reads] == [[1, 2], [3, 4], [5]]
+    assert job.status == SyncJob.Status.DONE
+    assert (job.checkpoint, job.processed, job.total) == (5, 5, 5)
+    assert list(
+        Product.objects.order_by("o_id").values_list("o_id", "title", "description")
+    ) == [(o_id, f"Product {o_id}", "") for o_id in range(1, 6)]
+
+
+def test_sync_resumes_from_checkpoint(odoo, company, products):
+    odoo.fail_on_read = 1
+    with pytest.raises(OSError):
+        Product.objects.sync(company)
+
+    job = SyncJob.objects.get()
+    assert job.status == SyncJob.Status.FAILED
+    assert (job.checkpoint, job.processed, job.total) == (2, 2, 5)
+    assert Product.objects.count() == 2
+
+    odoo.fail_on_read = None
+    odoo.calls.clear()
+    resumed = Product.objects.sync(company)
+
+    assert resumed.pk == job.pk
+    assert ("product.template", "search", ([("id", ">", 2)],)) in odoo.calls
+    assert [args[0] for args in odoo.reads] == [[3, 4], [5]]
+    assert resumed.status == SyncJob.Status.DONE
+    assert (resumed.checkpoint, resumed.processed, resumed.total) == (5, 5, 5)
+    assert Product.objects.count() == 5
+
+
+def test_sync_starts_new_job_after_done(odoo, company, products):
+    first = Product.objects.sync(company)
+    second = Product.objects.sync(company)
+
+    assert second.pk != first.pk
+    assert second.processed == 5
+
+
+def test_job_is_claimed_once(company):
+    job = SyncJob.objects.create(
+        o_company=company, model="cafes.Product", status=SyncJob.Status.FAILED
+    )
+    other = SyncJob.objects.get(pk=job.pk)
+
+    assert job.claim()
+    assert not other.claim()
+    assert job.status == SyncJob.Status.RUNNING
+
+
+def test_sync_skips_job_claimed_by_another_worker(odoo, company, products):
+    job = SyncJob.objects.create(
+        o_company=company, model="cafes.Product", status=SyncJob.Status.FAILED
+    )
+    SyncJob.objects.get(pk=job.pk).claim()
+
+    assert Product.objects.sync(company) == job
+    assert not odoo.reads
@@ -0,0 +1,121 @@
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from df_odoo.dispatcher import odoo_changes
+from df_odoo.drf.viewsets import ConnectionViewSet
+from df_odoo.models import SyncJob
+from df_odoo.settings import api_settings
+
+from .models import Product
+
+TOKEN = "secret"
+
+notify = ConnectionViewSet.as_view(
+    {"post": "notify"}, **ConnectionViewSet.notify.kwargs
+)
+
+
+@pytest.fixture(autouse=True)
+def no_coalesce_window(monkeypatch):
+    monkeypatch.setattr(api_settings, "WEBHOOK_COALESCE_WINDOW", 0, raising=False)
+
+
+@pytest.fixture
+def connection(company):
+    company.o_db.webhook_token = TOKEN
+    company.o_db.save()
+    return company.o_db
+
+
+@pytest.fixture
+def post(django_capture_on_commit_callbacks):
+    def post(connection, data, token=TOKEN):
+        request = APIRequestFactory().post(
+            "/", data, format="json", HTTP_X_ODOO_TOKEN=token
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            return notify(request, pk=str(connection.pk))
+
+    return post
+
+
+def test_notify_loads_changed_records(odoo, connection, post):
+    odoo.records[7] = {"id": 7, "name": "Tea", "description": "Green"}
+
+    response = post(connection, {"model": "product.template", "ids": [7, 7]})
+
+    assert response.status_code == 202
+    assert list(Product.objects.values_list("o_id", "title")) == [(7, "Tea")]
+
+
+def test_notify_skips_deleted_records(odoo, connection, post):
+    odoo.records[7] = {"id": 7, "name": "Tea", "description": "Green"}
+
+    response = post(connection, {"model": "product.template", "ids": [7, 8]})
+
+    assert response.status_code == 202
+    assert [args[0] for args in odoo.reads] == [[7]]
+    assert list(Product.objects.values_list("o_id", flat=True)) == [7]
+
+
+def test_notify_unlink_deletes_records(odoo, connection, company, post):
+    Product.objects.create(o_id=7, o_company=company)
+
+    response = post(
+        connection,
+        {"model": "product.template", "ids": [7], "operation": "unlink"},
+    )
+
+    assert response.status_code == 202
+    assert not Product.objects.exists()
+    assert SyncJob.objects.get().kind == SyncJob.Kind.UNLINK
+
+
+def test_notify_queues_ids_until_flushed(odoo, connection, post, monkeypatch):
+    monkeypatch.setattr(api_settings, "WEBHOOK_COALESCE_WINDOW", 60, raising=False)
+    odoo.records[7] = {"id": 7, "name": "Tea", "description": "Green"}
+    odoo.records[9] = {"id": 9, "name": "Coffee", "description": "Black"}
+
+    post(connection, {"model": "product.template", "ids": [9]})
+    response = post(connection, {"model": "product.template", "ids": [7]})
+
+    assert response.status_code == 202
+    job = SyncJob.objects.get()
+    assert job.status == SyncJob.Status.PENDING
+    assert job.object_ids == [7, 9]
+    assert not odoo.calls
+
+    odoo_changes.flush()
+
+    job.refresh_from_db()
+    assert job.status == SyncJob.Status.DONE
+    assert [args[0] for args in odoo.reads] == [[7, 9]]
+    assert sorted(Product.objects.values_list("o_id", flat=True)) == [7, 9]
+
+
+def test_failed_changes_resume_after_checkpoint(odoo, company, monkeypatch):
+    monkeypatch.setattr(api_settings, "SYNC_CHUNK_SIZE", 1, raising=False)
+    odoo.records[7] = {"id": 7, "name": "Tea", "description": "Green"}
+    odoo.records[9] = {"id": 9, "name": "Coffee", "description": "Black"}
+    odoo.fail_on_read = 1
+    job = SyncJob.objects.queue_changes(
+        company, "cafes.Product", SyncJob.Kind.CHANGES, [9, 7]
+    )
+
+    with pytest.raises(OSError):
+        job.run()
+    assert job.checkpoint == 7
+
+    odoo.fail_on_read = None
+    job.run()
+
+    assert [args[0] for args in odoo.reads] == [[7], [9], [9]]
+    assert job.progress == 100
+
+
+@pytest.mark.parametrize("token", ["wrong", "sécret", ""])
+def test_notify_rejects_invalid_token(odoo, connection, post, token):
+    response = post(connection, {"model": "product.template", "ids": [7]}, token)
+
+    assert response.status_code == 403
+    assert not odoo.calls